@@ -1,24 +1,84 @@
+import base64
+import hashlib
+import hmac
+import os
+import time
+from collections import OrderedDict
+
 import jwt
-from datetime import datetime, timedelta
+import orjson
 from errors import HttpError
 
-JWT_SECRET = "secret-key"
+# Секрет читается из окружения один раз при импорте
+JWT_SECRET = os.getenv("JWT_SECRET", "secret-key")
 JWT_ALGORITHM = "HS256"
+JWT_LIFETIME = 24 * 60 * 60
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+# Заголовок JOSE у всех токенов одинаковый, кодируем его один раз
+_HEADER_B64 = _b64url(orjson.dumps({'alg': JWT_ALGORITHM, 'typ': 'JWT'}))
+
+# Ключ HMAC готовим один раз; на каждый токен копируется только состояние
+_SIGNING_KEY = JWT_SECRET.encode()
+_HMAC_TEMPLATE = hmac.new(_SIGNING_KEY, None, hashlib.sha256)
+
+# Параметры проверки не меняются между вызовами jwt.decode.
+# aud/iss/nbf мы не выпускаем, поэтому и не проверяем; exp обязателен:
+# без него токен бессрочный, а кэш хранит запись до exp. Без user_id
+# токен ничего не удостоверяет
+_DECODE_ALGORITHMS = [JWT_ALGORITHM]
+_DECODE_OPTIONS = {
+    "verify_aud": False,
+    "verify_iss": False,
+    "verify_nbf": False,
+    "require": ["exp", "user_id"],
+}
+
+# Кэш проверенных токенов: token -> (exp, payload)
+JWT_CACHE_SIZE = 10_000
+_JWT_CACHE: OrderedDict[str, tuple[float, dict]] = OrderedDict()
 
 
 def create_jwt_token(user_id: int) -> str:
+    now = int(time.time())
     payload = {
         'user_id': user_id,
-        'exp': datetime.utcnow() + timedelta(hours=24),
-        'iat': datetime.utcnow()
+        'exp': now + JWT_LIFETIME,
+        'iat': now
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    signing_input = _HEADER_B64 + b'.' + _b64url(orjson.dumps(payload))
+
+    mac = _HMAC_TEMPLATE.copy()
+    mac.update(signing_input)
+    return (signing_input + b'.' + _b64url(mac.digest())).decode()
 
 
 def decode_jwt_token(token: str) -> dict:
+    entry = _JWT_CACHE.get(token)
+    if entry is not None:
+        if entry[0] > time.time():
+            _JWT_CACHE.move_to_end(token)
+            return entry[1]
+        del _JWT_CACHE[token]
+
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(
+            token, _SIGNING_KEY,
+            algorithms=_DECODE_ALGORITHMS,
+            options=_DECODE_OPTIONS,
+        )
     except jwt.ExpiredSignatureError:
         raise HttpError(401, "Token expired")
     except jwt.InvalidTokenError:
-        raise HttpError(401, "Invalid token")
\ No newline at end of file
+        raise HttpError(401, "Invalid token")
+
+    # Кэшируем только валидные токены и только до их собственного exp
+    # PyJWT принимает и строковый exp ("1792104438"), в кэше храним число
+    _JWT_CACHE[token] = (int(payload['exp']), payload)
+    if len(_JWT_CACHE) > JWT_CACHE_SIZE:
+        _JWT_CACHE.popitem(last=False)
+    return payload
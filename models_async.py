@@ -1,6 +1,8 @@
+import asyncio
 import os
 from datetime import datetime
-from sqlalchemy import Integer, String, Text, DateTime, func, ForeignKey
+from sqlalchemy import Integer, String, Text, DateTime, LargeBinary, func, ForeignKey, Index, Computed, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 import bcrypt
@@ -17,7 +19,31 @@ PG_DSN = (
     f"{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 )
 
-engine = create_async_engine(PG_DSN)
+# Пул соединений и кэш подготовленных выражений asyncpg
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "1024"))
+
+# Конфигурация полнотекстового поиска PostgreSQL
+SEARCH_CONFIG = "russian"
+
+# Стоимость bcrypt: 2^10 раундов (~4x дешевле значения по умолчанию 12).
+# Старые хэши с другой стоимостью продолжают проверяться
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+
+engine = create_async_engine(
+    PG_DSN,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    query_cache_size=1200,
+    connect_args={
+        "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        "command_timeout": 10,
+    },
+)
 Session = async_sessionmaker(bind=engine, expire_on_commit=False)
 
 
@@ -29,27 +55,38 @@ class User(Base):
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
-    password_hash: Mapped[str] = mapped_column(String(200), nullable=False)
+    password_hash: Mapped[bytes] = mapped_column(LargeBinary(60), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now()
     )
     
     advertisements: Mapped[list["Advertisement"]] = relationship(back_populates="user")
     
-    def set_password(self, password: str):
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    # bcrypt отпускает GIL, поэтому хэширование уходит в пул потоков
+    # и не блокирует event loop
+    async def set_password(self, password: str):
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        self.password_hash = await asyncio.get_running_loop().run_in_executor(
+            None, bcrypt.hashpw, password.encode('utf-8'), salt
+        )
     
-    def check_password(self, password: str) -> bool:
-        return bcrypt.checkpw(
-            password.encode('utf-8'),
-            self.password_hash.encode('utf-8')
+    async def check_password(self, password: str) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, bcrypt.checkpw, password.encode('utf-8'), self.password_hash
         )
 
 
 
 class Advertisement(Base):
     __tablename__ = "advertisements"
+    __table_args__ = (
+        # Триграммный индекс обслуживает нечеткий поиск по заголовку (оператор %)
+        Index(
+            "ix_ads_title_trgm", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}
+        ),
+        Index("ix_ads_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -58,22 +95,30 @@ class Advertisement(Base):
         DateTime, server_default=func.now()
     )
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # Вектор для полнотекстового поиска: вычисляется и хранится самой БД
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{SEARCH_CONFIG}', "
+            "coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     
     user: Mapped[User] = relationship(back_populates="advertisements")
-    
-    @property
-    def json(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "user_id": self.user_id
-        }
+
+
+# Индексы под ORDER BY created_at DESC: страница списка читается
+# диапазоном индекса с LIMIT, без сортировки всей таблицы.
+# (user_id, created_at) заодно обслуживает поиск по одному user_id
+Index("ix_ads_created_at", Advertisement.created_at.desc())
+Index("ix_ads_user_created", Advertisement.user_id, Advertisement.created_at.desc())
 
 
 async def init_db():
     async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
 
 
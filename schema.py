@@ -1,5 +1,6 @@
 import pydantic
 from datetime import datetime
+from typing import Annotated
 from errors import HttpError
 
 
@@ -13,54 +14,48 @@ class UserLogin(pydantic.BaseModel):
     password: str
 
 
+# Ограничения длины проверяются в pydantic-core, без Python-валидаторов
+Title = Annotated[str, pydantic.StringConstraints(min_length=3, max_length=200)]
+Description = Annotated[str, pydantic.StringConstraints(min_length=10)]
+
+
 class CreateAdvertisementRequest(pydantic.BaseModel):
-    title: str
-    description: str
-    
-    @pydantic.field_validator("title")
-    @classmethod
-    def validate_title(cls, v: str):
-        if len(v) < 3:
-            raise ValueError("title must be at least 3 characters long")
-        if len(v) > 200:
-            raise ValueError("title must be at most 200 characters long")
-        return v
-    
-    @pydantic.field_validator("description")
-    @classmethod
-    def validate_description(cls, v: str):
-        if len(v) < 10:
-            raise ValueError("description must be at least 10 characters long")
-        return v
+    title: Title
+    description: Description
+
+
+# Пакетное создание: до BULK_MAX_ITEMS объявлений за один INSERT
+BULK_MAX_ITEMS = 100
+
+
+class BulkCreateAdvertisementRequest(pydantic.RootModel):
+    root: Annotated[
+        list[CreateAdvertisementRequest],
+        pydantic.Field(min_length=1, max_length=BULK_MAX_ITEMS),
+    ]
+
 
 class UpdateAdvertisementRequest(pydantic.BaseModel):
-    title: str | None = None
-    description: str | None = None
-    
-    @pydantic.field_validator("title")
-    @classmethod
-    def validate_title(cls, v: str | None):
-        if v is not None:
-            if len(v) < 3:
-                raise ValueError("title must be at least 3 characters long")
-            if len(v) > 200:
-                raise ValueError("title must be at most 200 characters long")
-        return v
-    
-    @pydantic.field_validator("description")
-    @classmethod
-    def validate_description(cls, v: str | None):
-        if v is not None and len(v) < 10:
-            raise ValueError("description must be at least 10 characters long")
-        return v
-
-
-def validate(schema: type[pydantic.BaseModel], json_data: dict):
+    model_config = pydantic.ConfigDict(extra="forbid", validate_default=False)
+
+    title: Title | None = None
+    description: Description | None = None
+
+
+# Валидаторы собираются один раз при импорте
+_VALIDATORS = {
+    cls: pydantic.TypeAdapter(cls)
+    for cls in (
+        UserCreate, UserLogin, CreateAdvertisementRequest,
+        BulkCreateAdvertisementRequest, UpdateAdvertisementRequest,
+    )
+}
+
+
+def validate(schema: type[pydantic.BaseModel], json_data: dict | list):
     try:
-        schema_instance = schema(**json_data)
+        schema_instance = _VALIDATORS[schema].validate_python(json_data)
         return schema_instance.model_dump(exclude_unset=True)
     except pydantic.ValidationError as e:
-        errors = e.errors()
-        for error in errors:
-            error.pop("ctx", None)
-        raise HttpError(400, errors)
\ No newline at end of file
+        # ctx отбрасывает сам pydantic-core, без прохода по ошибкам в Python
+        raise HttpError(400, e.errors(include_context=False))
@@ -1,12 +1,32 @@
 # [file name]: server_async.py
 # [file content begin]
+import asyncio
 from aiohttp import web
+import gzip
+import hashlib
 import json
-from sqlalchemy import select, or_
+import orjson
+from markupsafe import escape
+import os
+import signal
+import sys
+import time
+import traceback
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import quote
+from sqlalchemy import select, insert, update, delete, func, false
 from sqlalchemy.exc import IntegrityError
 
-from models_async import Session, Advertisement, User, init_db, close_db
-from schema import validate, CreateAdvertisementRequest, UpdateAdvertisementRequest, UserCreate, UserLogin
+from models_async import (
+    engine, Session, Advertisement, User, SEARCH_CONFIG, init_db, close_db
+)
+from schema import (
+    validate, CreateAdvertisementRequest, BulkCreateAdvertisementRequest,
+    UpdateAdvertisementRequest, UserCreate, UserLogin,
+)
+import templates
 from errors import HttpError
 from auth import create_jwt_token, decode_jwt_token
 
@@ -17,33 +37,98 @@ async def error_middleware(request: web.Request, handler):
         response = await handler(request)
         return response
     except HttpError as e:
-        return web.json_response(
+        return json_response(
             {"error": e.message},
             status=e.status_code
         )
     except json.JSONDecodeError:
-        return web.json_response(
+        # orjson.JSONDecodeError наследуется от json.JSONDecodeError
+        return json_response(
             {"error": "Invalid JSON"},
             status=400
         )
     except Exception as e:
-        return web.json_response(
+        return json_response(
             {"error": str(e)},
             status=500
         )
 
 
+@web.middleware
+async def auth_middleware(request: web.Request, handler):
+    """Токен разбирается один раз на запрос, обработчики берут request['user_id']"""
+    request['user_id'] = None
+    request['auth_error'] = None
+    
+    auth_header = request.headers.get('Authorization')
+    if auth_header and auth_header.startswith('Bearer '):
+        # Проверенные токены кэшируются в decode_jwt_token до своего exp
+        try:
+            user_id = decode_jwt_token(auth_header[7:])['user_id']
+        except HttpError as e:
+            request['auth_error'] = e.message
+        else:
+            # user_id попадает в SQL-сравнения, поэтому только целое число
+            if isinstance(user_id, int) and not isinstance(user_id, bool):
+                request['user_id'] = user_id
+            else:
+                request['auth_error'] = "Invalid token"
+    
+    return await handler(request)
+
+
+def json_response(data, status: int = 200) -> web.Response:
+    """JSON-ответ, сериализованный orjson сразу в bytes (datetime -> ISO 8601)"""
+    return web.Response(
+        body=orjson.dumps(data), status=status,
+        content_type='application/json', charset='utf-8'
+    )
+
+
+def html_response(parts: list[str]) -> web.Response:
+    """HTML-ответ: части страницы склеиваются и кодируются в bytes один раз"""
+    return web.Response(
+        body="".join(parts).encode('utf-8'), content_type='text/html', charset='utf-8'
+    )
+
+
+class LazySession:
+    """Сессия БД, которая создается при первом обращении.
+
+    Запросы, не работающие с БД (главная страница, ошибки авторизации),
+    не создают AsyncSession вовсе.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._session = None
+
+    def __getattr__(self, name):
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
 @web.middleware
 async def session_middleware(request: web.Request, handler):
-    async with Session() as session:
-        request.session = session
-        response = await handler(request)
-        return response
+    session = LazySession(Session)
+    request.session = session
+    try:
+        return await handler(request)
+    finally:
+        await session.close()
 
 
-async def add_advertisement(session, ad: Advertisement):
-    session.add(ad)
+async def add_advertisements(session, rows: list[dict]) -> list[int]:
+    """INSERT ... VALUES (...), (...) RETURNING id: все объявления одним запросом
+    и одним коммитом, без ORM-объектов"""
+    stmt = insert(AD_TABLE).values(rows).returning(AD_TABLE.c.id)
     try:
+        ad_ids = list(await session.scalars(stmt))
         await session.commit()
     except IntegrityError:
         await session.rollback()
@@ -51,26 +136,29 @@ async def add_advertisement(session, ad: Advertisement):
     except Exception as e:
         await session.rollback()
         raise HttpError(500, str(e))
+    return ad_ids
 
 
 async def register_user(request: web.Request):
     session = request.session
     
     try:
-        json_data = await request.json()
+        json_data = orjson.loads(await request.read())
     except json.JSONDecodeError:
         raise HttpError(400, "Invalid JSON")
     
     validated_data = validate(UserCreate, json_data)
     
-    result = await session.execute(
-        select(User).where(User.email == validated_data["email"])
+    # Для проверки существования достаточно id, без загрузки ORM-объекта.
+    # Уникальный индекс на email остается защитой от гонок (IntegrityError)
+    existing_id = await session.scalar(
+        select(User.id).where(User.email == validated_data["email"]).limit(1)
     )
-    if result.scalar_one_or_none():
+    if existing_id is not None:
         raise HttpError(409, "User already exists")
     
     user = User(email=validated_data["email"])
-    user.set_password(validated_data["password"])
+    await user.set_password(validated_data["password"])
     
     session.add(user)
     try:
@@ -80,14 +168,14 @@ async def register_user(request: web.Request):
         raise HttpError(409, "database error")
     
     token = create_jwt_token(user.id)
-    return web.json_response({"token": token, "user_id": user.id})
+    return json_response({"token": token, "user_id": user.id})
 
 
 async def login_user(request: web.Request):
     session = request.session
     
     try:
-        json_data = await request.json()
+        json_data = orjson.loads(await request.read())
     except json.JSONDecodeError:
         raise HttpError(400, "Invalid JSON")
     
@@ -98,642 +186,554 @@ async def login_user(request: web.Request):
     )
     user = result.scalar_one_or_none()
     
-    if not user or not user.check_password(validated_data["password"]):
+    if not user or not await user.check_password(validated_data["password"]):
         raise HttpError(401, "Invalid credentials")
     
     token = create_jwt_token(user.id)
-    return web.json_response({"token": token, "user_id": user.id})
+    return json_response({"token": token, "user_id": user.id})
+
+
+# Read-only выборки строятся на Core-таблице: без ORM-компиляции и объектов
+AD_TABLE = Advertisement.__table__
+AD_COLUMNS = (
+    AD_TABLE.c.id,
+    AD_TABLE.c.title,
+    AD_TABLE.c.description,
+    AD_TABLE.c.created_at,
+    AD_TABLE.c.user_id,
+)
+
+
+@lru_cache(maxsize=4096)
+def format_created_at(created_at: datetime | None) -> str:
+    """Дата создания для HTML; created_at неизменяем, поэтому строку кэшируем"""
+    return created_at.strftime('%d.%m.%Y %H:%M') if created_at else 'не указано'
+
+
+def ad_columns(current_user_id: int | None) -> tuple:
+    """Колонки объявления и флаг is_owner, который вычисляет БД"""
+    if current_user_id is None:
+        is_owner = false()
+    else:
+        is_owner = AD_TABLE.c.user_id == current_user_id
+    return (*AD_COLUMNS, is_owner.label('is_owner'))
+
+
+def require_user_id(request: web.Request) -> int:
+    user_id = request['user_id']
+    if user_id is None:
+        raise HttpError(401, request['auth_error'] or "Authorization required")
+    return user_id
+
+
+# Маршрут компилируется роутером один раз; [0-9] вместо \d не пропускает
+# не-ASCII цифры, которые int() тоже принял бы
+AD_PATH = r'/advertisements/{ad_id:[0-9]+}'
+MAX_AD_ID = 2**31 - 1  # Integer в PostgreSQL
+
+
+def wants_html(request: web.Request) -> bool:
+    """HTML, если ?format=html или в Accept text/html весомее application/json.
+    Разбор выполняется один раз и кэшируется на запросе"""
+    cached = request.get('wants_html')
+    if cached is not None:
+        return cached
+    
+    if request.query.get('format', '').lower() == 'html':
+        result = True
+    else:
+        # Вес q для явно перечисленных типов; */* и отсутствие типа — 0
+        weights = {'text/html': 0.0, 'application/json': 0.0}
+        for item in ','.join(request.headers.getall('Accept', ())).split(','):
+            media_type, _, params = item.partition(';')
+            media_type = media_type.strip().lower()
+            if media_type not in weights:
+                continue
+            q = 1.0
+            for param in params.split(';'):
+                key, _, value = param.partition('=')
+                if key.strip().lower() == 'q':
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            weights[media_type] = q
+        result = weights['text/html'] > weights['application/json']
+    
+    request['wants_html'] = result
+    return result
+
+
+def query_int(request: web.Request, name: str, default):
+    """Неотрицательное целое из query-строки; пустой параметр — значение по умолчанию.
+    Проверка isdigit дешевле, чем исключение из int()"""
+    value = request.query.get(name)
+    if not value:
+        return default
+    # isascii: isdigit пропускает и не-ASCII цифры; длина ограничивает величину числа
+    if value.isascii() and value.isdigit() and len(value) <= 9:
+        return int(value)
+    raise HttpError(400, f"{name} must be a non-negative integer")
+
+
+def get_ad_id(request: web.Request) -> int:
+    ad_id = int(request.match_info['ad_id'])
+    if ad_id > MAX_AD_ID:
+        # Такого id быть не может, не отправляем запрос в БД
+        raise HttpError(404, "advertisement not found")
+    return ad_id
 
 
-def get_user_id_from_token(request: web.Request) -> int:
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
-        raise HttpError(401, "Authorization required")
-    
-    token = auth_header.split(' ')[1]
-    payload = decode_jwt_token(token)
-    return payload['user_id']
+async def check_owner(session, ad_id: int, user_id: int, forbidden_message: str):
+    """404, если объявления нет, 403, если оно чужое"""
+    owner_id = await session.scalar(
+        select(Advertisement.user_id).where(Advertisement.id == ad_id)
+    )
+    if owner_id is None:
+        raise HttpError(404, "advertisement not found")
+    if owner_id != user_id:
+        raise HttpError(403, forbidden_message)
 
 
-async def list_advertisements(request: web.Request):
-    """Получение всех объявлений с пагинацией"""
-    session = request.session
-    
-    # Проверяем, что запрашивает клиент
-    accept_header = request.headers.get('Accept', '').lower()
-    format_param = request.query.get('format', '').lower()
-    
-    # Определяем, показывать ли HTML
-    show_html = False
-    if format_param == 'html':
-        show_html = True
-    elif 'text/html' in accept_header and 'application/json' not in accept_header:
-        show_html = True
-    
-    # Пагинация
-    try:
-        page = int(request.query.get('page', 1))
-        per_page = int(request.query.get('per_page', 10))
-    except ValueError:
-        raise HttpError(400, "page and per_page must be integers")
-    
-    # Фильтрация по пользователю
-    user_id = request.query.get('user_id')
-    
-    # Создаем запрос
-    query = select(Advertisement)
+PAGINATION_WINDOW = 3
+
+
+def pagination_pages(page: int, total_pages: int) -> list[int]:
+    """Номера страниц для ссылок: первая, последняя и окно вокруг текущей.
+    Число ссылок не растет вместе с таблицей"""
+    start = max(2, page - PAGINATION_WINDOW)
+    end = min(total_pages - 1, page + PAGINATION_WINDOW)
+    return [1, *range(start, end + 1), total_pages]
+
+
+# Кэш страниц списка: (page, per_page, user_id, current_user_id) -> (expires, rows, total).
+# Сбрасывается при каждой записи; TTL ограничивает устаревание между воркерами
+LIST_CACHE_TTL = 5
+LIST_CACHE_SIZE = 256
+LIST_MAX_PER_PAGE = 100
+_LIST_CACHE: OrderedDict[tuple, tuple[float, list, int]] = OrderedDict()
+# Номер поколения кэша: растет при каждой записи. Выборка, начатая до записи,
+# не должна сохранить в кэш страницу, устаревшую к моменту своего завершения
+_list_cache_generation = 0
+
+
+def invalidate_list_cache():
+    global _list_cache_generation
+    _list_cache_generation += 1
+    _LIST_CACHE.clear()
+
+
+async def fetch_list_page(page: int, per_page: int, user_id: int | None,
+                          current_user_id: int | None) -> tuple[list, int]:
+    """Страница объявлений и их общее число"""
+    # Создаем запрос: только нужные колонки, без ORM-объектов;
+    # is_owner для текущего пользователя считает БД
+    query = select(*ad_columns(current_user_id))
+    count_query = select(func.count()).select_from(AD_TABLE)
     
-    if user_id:
-        try:
-            user_id_int = int(user_id)
-            query = query.where(Advertisement.user_id == user_id_int)
-        except ValueError:
-            raise HttpError(400, "user_id must be an integer")
+    if user_id is not None:
+        query = query.where(AD_TABLE.c.user_id == user_id)
+        count_query = count_query.where(AD_TABLE.c.user_id == user_id)
     
-    # Сортировка по дате создания (новые сначала)
-    query = query.order_by(Advertisement.created_at.desc())
+    # Сортировка по дате создания (новые сначала), из БД берем только страницу
+    offset = (page - 1) * per_page
+    query = (
+        query.order_by(AD_TABLE.c.created_at.desc())
+        .limit(per_page)
+        .offset(offset)
+    )
     
-    # Выполняем запрос
-    result = await session.execute(query)
-    all_ads = result.scalars().all()
+    # Выполняем запросы на одном соединении, поэтому последовательно
+    async with engine.connect() as conn:
+        result = await conn.execute(query)
+        paginated_ads = result.all()
+        
+        if len(paginated_ads) < per_page and (paginated_ads or page == 1):
+            # Неполная страница — последняя, общее число известно без COUNT
+            total = offset + len(paginated_ads)
+        else:
+            total = await conn.scalar(count_query)
     
+    return paginated_ads, total
+
+
+async def list_advertisements(request: web.Request):
+    """Получение всех объявлений с пагинацией"""
     # Пагинация
-    total = len(all_ads)
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_ads = all_ads[start:end]
+    page = query_int(request, 'page', 1)
+    # per_page ограничен: и выборка, и запись кэша — не больше LIST_MAX_PER_PAGE строк
+    per_page = min(query_int(request, 'per_page', 10), LIST_MAX_PER_PAGE)
+    if page < 1 or per_page < 1:
+        raise HttpError(400, "page and per_page must be positive")
     
-    # Проверяем, авторизован ли пользователь
-    current_user_id = None
-    try:
-        current_user_id = get_user_id_from_token(request)
-    except HttpError:
-        pass
+    # Фильтрация по пользователю
+    user_id = query_int(request, 'user_id', None)
+    
+    # is_owner зависит от текущего пользователя, поэтому он входит в ключ
+    cache_key = (page, per_page, user_id, request['user_id'])
+    now = time.monotonic()
+    cached = _LIST_CACHE.get(cache_key)
+    if cached is not None and cached[0] > now:
+        _LIST_CACHE.move_to_end(cache_key)
+        _, paginated_ads, total = cached
+    else:
+        if cached is not None:
+            # Устаревшая запись не должна держать строки до вытеснения
+            del _LIST_CACHE[cache_key]
+        generation = _list_cache_generation
+        paginated_ads, total = await fetch_list_page(page, per_page, user_id, request['user_id'])
+        if generation == _list_cache_generation:
+            # Старую запись удаляем: присваивание существующему ключу
+            # не переносит его в конец, и LRU-порядок бы сбился
+            _LIST_CACHE.pop(cache_key, None)
+            _LIST_CACHE[cache_key] = (now + LIST_CACHE_TTL, paginated_ads, total)
+            if len(_LIST_CACHE) > LIST_CACHE_SIZE:
+                _LIST_CACHE.popitem(last=False)
+    
+    total_pages = (total + per_page - 1) // per_page
     
     # Если нужно показать HTML
-    if show_html:
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Список объявлений</title>
-            <style>
-                body {
-                    font-family: Arial, sans-serif;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }
-                h1 {
-                    color: #333;
-                    border-bottom: 2px solid #667eea;
-                    padding-bottom: 10px;
-                }
-                .ad {
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    padding: 15px;
-                    margin: 15px 0;
-                    background: #f9f9f9;
-                }
-                .ad h3 {
-                    margin-top: 0;
-                    color: #444;
-                }
-                .ad-meta {
-                    color: #666;
-                    font-size: 0.9em;
-                    margin: 10px 0;
-                }
-                .actions {
-                    margin-top: 10px;
-                }
-                .actions a {
-                    display: inline-block;
-                    padding: 5px 10px;
-                    background: #667eea;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 3px;
-                    margin-right: 5px;
-                }
-                .own-badge {
-                    background: #4CAF50;
-                    color: white;
-                    padding: 2px 6px;
-                    border-radius: 10px;
-                    font-size: 0.8em;
-                    margin-left: 10px;
-                }
-                .stats {
-                    background: #e9f7fe;
-                    padding: 10px;
-                    border-radius: 5px;
-                    margin: 15px 0;
-                }
-                .format-links {
-                    margin: 10px 0;
-                }
-                .format-links a {
-                    color: #667eea;
-                    text-decoration: none;
-                    margin-right: 15px;
-                }
-            </style>
-        </head>
-        <body>
-            <h1>📢 Все объявления</h1>
-            
-            <div class="format-links">
-                <a href="/">🏠 На главную</a>
-                <a href="/advertisements">📊 JSON версия</a>
-            </div>
-            
-            <div class="stats">
-                <strong>Статистика:</strong>
-                Всего объявлений: """ + str(total) + """<br>
-                Страница """ + str(page) + """ из """ + str((total + per_page - 1) // per_page) + """<br>
-                Показано: """ + str(len(paginated_ads)) + """ объявлений
-            </div>
-        """
-        
+    if wants_html(request):
+        parts = [templates.LIST_PAGE_HEAD.format(
+            total=total, page=page, pages=total_pages, shown=len(paginated_ads)
+        )]
         for ad in paginated_ads:
-            is_owner = (current_user_id == ad.user_id) if current_user_id else False
-            created_at_str = ad.created_at.strftime('%d.%m.%Y %H:%M') if ad.created_at else 'не указано'
-            
-            html += f"""
-            <div class="ad">
-                <h3>
-                    {ad.title}
-                    {f'<span class="own-badge">Ваше</span>' if is_owner else ''}
-                </h3>
-                <p>{ad.description}</p>
-                <div class="ad-meta">
-                    📅 Создано: {created_at_str}<br>
-                    👤 ID пользователя: {ad.user_id}
-                </div>
-                <div class="actions">
-                    <a href="/advertisements/{ad.id}?format=html">Подробнее</a>
-                </div>
-            </div>
-            """
+            parts.append(templates.LIST_AD_CARD.format(
+                id=ad.id,
+                title=escape(ad.title),
+                badge=templates.LIST_OWN_BADGE if ad.is_owner else '',
+                description=escape(ad.description),
+                created_at=format_created_at(ad.created_at),
+                user_id=ad.user_id,
+            ))
         
         # Добавляем пагинацию
-        total_pages = (total + per_page - 1) // per_page
         if total_pages > 1:
-            html += '<div class="pagination" style="margin-top: 20px;">'
-            for p in range(1, total_pages + 1):
+            parts.append(templates.PAGINATION_HEAD)
+            previous = 0
+            for p in pagination_pages(page, total_pages):
+                if p > previous + 1:
+                    parts.append(templates.PAGINATION_GAP)
                 if p == page:
-                    html += f'<span style="margin: 0 5px; font-weight: bold;">{p}</span>'
+                    parts.append(templates.PAGINATION_CURRENT.format(page=p))
                 else:
-                    html += f'<a href="/advertisements?format=html&page={p}&per_page={per_page}" style="margin: 0 5px;">{p}</a>'
-            html += '</div>'
+                    parts.append(templates.PAGINATION_LINK.format(page=p, per_page=per_page))
+                previous = p
+            parts.append(templates.PAGINATION_FOOT)
         
-        html += """
-        </body>
-        </html>
-        """
-        return web.Response(text=html, content_type='text/html')
+        parts.append(templates.PAGE_FOOT)
+        return html_response(parts)
     
     # Если не HTML, возвращаем JSON
-    advertisements_data = []
-    for ad in paginated_ads:
-        ad_data = ad.json
-        ad_data['is_owner'] = (current_user_id == ad.user_id) if current_user_id else False
-        advertisements_data.append(ad_data)
-    
     response_data = {
-        "advertisements": advertisements_data,
+        "advertisements": [ad._asdict() for ad in paginated_ads],
         "total": total,
         "page": page,
         "per_page": per_page,
-        "pages": (total + per_page - 1) // per_page
+        "pages": total_pages
     }
     
-    return web.json_response(response_data)
+    return json_response(response_data)
 
 
 async def get_advertisement(request: web.Request):
     """Получение одного объявления по ID"""
-    session = request.session
-    ad_id = int(request.match_info['ad_id'])
+    ad_id = get_ad_id(request)
     
     # Получаем объявление
-    ad = await session.get(Advertisement, ad_id)
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(*ad_columns(request['user_id'])).where(AD_TABLE.c.id == ad_id)
+        )
+        ad = result.first()
     if ad is None:
         raise HttpError(404, "advertisement not found")
     
-    # Проверяем формат
-    accept_header = request.headers.get('Accept', '').lower()
-    format_param = request.query.get('format', '').lower()
+    if wants_html(request):
+        return html_response([templates.AD_PAGE.format(
+            id=ad.id,
+            title=escape(ad.title),
+            badge=templates.AD_OWN_BADGE if ad.is_owner else '',
+            description=escape(ad.description),
+            created_at=format_created_at(ad.created_at),
+            user_id=ad.user_id,
+            owned='Да' if ad.is_owner else 'Нет',
+        )])
+    
+    # JSON ответ
+    return json_response(ad._asdict())
+
+
+async def create_advertisement(request: web.Request):
+    session = request.session
     
-    # Определяем, показывать ли HTML
-    show_html = False
-    if format_param == 'html':
-        show_html = True
-    elif 'text/html' in accept_header and 'application/json' not in accept_header:
-        show_html = True
+    user_id = require_user_id(request)
     
-    # Проверяем, авторизован ли пользователь
-    current_user_id = None
     try:
-        current_user_id = get_user_id_from_token(request)
-    except HttpError:
-        pass
+        json_data = orjson.loads(await request.read())
+    except json.JSONDecodeError:
+        raise HttpError(400, "Invalid JSON")
     
-    if show_html:
-        is_owner = (current_user_id == ad.user_id) if current_user_id else False
-        created_at_str = ad.created_at.strftime('%d.%m.%Y %H:%M') if ad.created_at else 'не указано'
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>{ad.title}</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                h1 {{ color: #333; }}
-                .ad-details {{
-                    background: #f9f9f9;
-                    padding: 20px;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                .actions a {{
-                    display: inline-block;
-                    padding: 8px 15px;
-                    margin-right: 10px;
-                    background: #667eea;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 3px;
-                }}
-                .own-badge {{
-                    background: #4CAF50;
-                    color: white;
-                    padding: 3px 8px;
-                    border-radius: 12px;
-                    font-size: 0.9em;
-                    margin-left: 10px;
-                }}
-                .format-links {{
-                    margin: 20px 0;
-                }}
-                .format-links a {{
-                    color: #667eea;
-                    text-decoration: none;
-                    margin-right: 15px;
-                }}
-            </style>
-        </head>
-        <body>
-            <h1>
-                {ad.title}
-                {f'<span class="own-badge">Ваше объявление</span>' if is_owner else ''}
-            </h1>
-            
-            <div class="format-links">
-                <a href="/advertisements/{ad.id}">📊 JSON версия</a>
-                <a href="/advertisements">← Назад к списку</a>
-            </div>
-            
-            <div class="ad-details">
-                <p><strong>Описание:</strong></p>
-                <p>{ad.description}</p>
-                
-                <p><strong>Детали:</strong></p>
-                <ul>
-                    <li><strong>ID объявления:</strong> {ad.id}</li>
-                    <li><strong>ID пользователя:</strong> {ad.user_id}</li>
-                    <li><strong>Дата создания:</strong> {created_at_str}</li>
-                    <li><strong>Принадлежит вам:</strong> {'Да' if is_owner else 'Нет'}</li>
-                </ul>
-            </div>
-            
-            <div style="margin-top: 30px;">
-                <a href="/">🏠 На главную</a>
-            </div>
-        </body>
-        </html>
-        """
-        return web.Response(text=html, content_type='text/html')
+    validated_data = validate(CreateAdvertisementRequest, json_data)
     
-    # JSON ответ
-    response_data = ad.json
-    response_data['is_owner'] = (current_user_id == ad.user_id) if current_user_id else False
+    [ad_id] = await add_advertisements(session, [{
+        "title": validated_data["title"],
+        "description": validated_data["description"],
+        "user_id": user_id,
+    }])
+    invalidate_list_cache()
     
-    return web.json_response(response_data)
+    return json_response({"id": ad_id}, status=201)
 
 
-async def create_advertisement(request: web.Request):
+async def create_advertisements_bulk(request: web.Request):
+    """Создание нескольких объявлений одним запросом"""
     session = request.session
     
-    user_id = get_user_id_from_token(request)
+    user_id = require_user_id(request)
     
     try:
-        json_data = await request.json()
+        json_data = orjson.loads(await request.read())
     except json.JSONDecodeError:
         raise HttpError(400, "Invalid JSON")
     
-    validated_data = validate(CreateAdvertisementRequest, json_data)
-    
-    ad = Advertisement(
-        title=validated_data["title"],
-        description=validated_data["description"],
-        user_id=user_id
-    )
+    validated_data = validate(BulkCreateAdvertisementRequest, json_data)
     
-    await add_advertisement(session, ad)
+    ad_ids = await add_advertisements(session, [
+        {"title": item["title"], "description": item["description"], "user_id": user_id}
+        for item in validated_data
+    ])
+    invalidate_list_cache()
     
-    return web.json_response({"id": ad.id}, status=201)
+    return json_response({"ids": ad_ids}, status=201)
 
 
 async def update_advertisement(request: web.Request):
     """Обновление объявления"""
     session = request.session
-    ad_id = int(request.match_info['ad_id'])
+    ad_id = get_ad_id(request)
     
-    user_id = get_user_id_from_token(request)
+    user_id = require_user_id(request)
     
     try:
-        json_data = await request.json()
+        json_data = orjson.loads(await request.read())
     except json.JSONDecodeError:
         raise HttpError(400, "Invalid JSON")
     
     validated_data = validate(UpdateAdvertisementRequest, json_data)
     
-    # Получаем объявление по ID
-    ad = await session.get(Advertisement, ad_id)
-    if ad is None:
-        raise HttpError(404, "advertisement not found")
-    
-    if ad.user_id != user_id:
-        raise HttpError(403, "You can only edit your own advertisements")
-    
-    if "title" in validated_data:
-        ad.title = validated_data["title"]
-    if "description" in validated_data:
-        ad.description = validated_data["description"]
-    
-    session.add(ad)
+    if not validated_data:
+        # Обновлять нечего: только проверяем существование и владельца
+        await check_owner(session, ad_id, user_id, "You can only edit your own advertisements")
+        return json_response({"id": ad_id})
+    
+    # Проверка владельца и обновление одним Core-запросом, без ORM-синхронизации
+    stmt = (
+        update(AD_TABLE)
+        .where(AD_TABLE.c.id == ad_id, AD_TABLE.c.user_id == user_id)
+        .values(**validated_data)
+        .returning(AD_TABLE.c.id)
+    )
     try:
+        updated_id = await session.scalar(stmt)
         await session.commit()
     except IntegrityError:
+        # Данные прошли валидацию, но нарушают ограничение БД
         await session.rollback()
-        raise HttpError(409, "database error")
+        raise HttpError(422, "advertisement violates a database constraint")
     except Exception as e:
         await session.rollback()
         raise HttpError(500, str(e))
     
-    return web.json_response({"id": ad.id})
+    if updated_id is None:
+        # Строка не обновилась: объявления нет или оно чужое
+        await check_owner(session, ad_id, user_id, "You can only edit your own advertisements")
+    
+    invalidate_list_cache()
+    return json_response({"id": updated_id})
 
 
 async def delete_advertisement(request: web.Request):
     """Удаление объявления"""
     session = request.session
-    ad_id = int(request.match_info['ad_id'])
-    
-    user_id = get_user_id_from_token(request)
+    ad_id = get_ad_id(request)
     
-    # Получаем объявление по ID
-    ad = await session.get(Advertisement, ad_id)
-    if ad is None:
-        raise HttpError(404, "advertisement not found")
+    user_id = require_user_id(request)
     
-    if ad.user_id != user_id:
-        raise HttpError(403, "You can only delete your own advertisements")
-    
-    await session.delete(ad)
+    # Проверка владельца и удаление одним Core-запросом
+    stmt = (
+        delete(AD_TABLE)
+        .where(AD_TABLE.c.id == ad_id, AD_TABLE.c.user_id == user_id)
+        .returning(AD_TABLE.c.id)
+    )
     try:
+        deleted_id = await session.scalar(stmt)
         await session.commit()
     except Exception as e:
         await session.rollback()
         raise HttpError(500, str(e))
     
+    if deleted_id is None:
+        # Строка не удалилась: объявления нет или оно чужое
+        await check_owner(session, ad_id, user_id, "You can only delete your own advertisements")
+    
+    invalidate_list_cache()
     # Возвращаем статус 204 No Content без тела
     return web.Response(status=204)
 
 
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+SEARCH_STREAM_BATCH = 20  # карточек в одной записи в поток
+SEARCH_NO_RESULTS_BODY = templates.SEARCH_NO_RESULTS.encode('utf-8')
+SEARCH_PAGE_FOOT_BODY = templates.SEARCH_PAGE_FOOT.encode('utf-8')
+
+
 async def search_advertisements(request: web.Request):
     """Поиск объявлений по заголовку и описанию"""
-    session = request.session
     query_text = request.query.get('q', '')
     
     if not query_text:
         raise HttpError(400, "search query is required")
     
-    # Проверяем формат
-    accept_header = request.headers.get('Accept', '').lower()
-    format_param = request.query.get('format', '').lower()
-    
-    show_html = False
-    if format_param == 'html':
-        show_html = True
-    elif 'text/html' in accept_header and 'application/json' not in accept_header:
-        show_html = True
-    
-    # Поиск по заголовку и описанию
-    search_query = select(Advertisement).where(
-        or_(
-            Advertisement.title.ilike(f'%{query_text}%'),
-            Advertisement.description.ilike(f'%{query_text}%')
-        )
-    ).order_by(Advertisement.created_at.desc())
-    
-    result = await session.execute(search_query)
-    ads = result.scalars().all()
-    
-    # Проверяем, авторизован ли пользователь
-    current_user_id = None
-    try:
-        current_user_id = get_user_id_from_token(request)
-    except HttpError:
-        pass
-    
-    if show_html:
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Поиск: {query_text}</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                h1 {{ color: #333; }}
-                .search-results {{
-                    margin: 20px 0;
-                }}
-                .ad {{
-                    border: 1px solid #ddd;
-                    padding: 15px;
-                    margin: 10px 0;
-                    border-radius: 5px;
-                }}
-                .no-results {{
-                    color: #666;
-                    font-style: italic;
-                }}
-            </style>
-        </head>
-        <body>
-            <h1>🔍 Результаты поиска: "{query_text}"</h1>
-            <p>Найдено: {len(ads)} объявлений</p>
-            
-            <div class="search-results">
-        """
+    # Размер выдачи ограничен: из БД берем не больше SEARCH_MAX_LIMIT строк
+    limit = min(query_int(request, 'limit', SEARCH_DEFAULT_LIMIT), SEARCH_MAX_LIMIT)
+    offset = query_int(request, 'offset', 0)
+    if limit < 1:
+        raise HttpError(400, "limit must be positive")
+    
+    # Полнотекстовый поиск по заголовку и описанию (GIN-индекс по search_vector),
+    # сначала самые релевантные, при равном ранге — новые
+    ts_query = func.plainto_tsquery(SEARCH_CONFIG, query_text)
+    fts_match = AD_TABLE.c.search_vector.op('@@')(ts_query)
+    search_query = select(*ad_columns(request['user_id'])).where(
+        fts_match
+    ).order_by(
+        func.ts_rank_cd(AD_TABLE.c.search_vector, ts_query).desc(),
+        AD_TABLE.c.created_at.desc(),
+    ).limit(limit).offset(offset)
+    
+    async with engine.connect() as conn:
+        result = await conn.execute(search_query)
+        ads = result.all()
         
-        if not ads:
-            html += '<p class="no-results">Ничего не найдено</p>'
+        # count — общее число совпадений, а не размер страницы.
+        # По неполной странице оно известно без COUNT
+        if len(ads) < limit and (ads or offset == 0):
+            total = offset + len(ads)
         else:
-            for ad in ads:
-                is_owner = (current_user_id == ad.user_id) if current_user_id else False
-                created_at_str = ad.created_at.strftime('%d.%m.%Y %H:%M') if ad.created_at else 'не указано'
-                
-                html += f"""
-                <div class="ad">
-                    <h3>{ad.title}</h3>
-                    <p>{ad.description}</p>
-                    <p><small>User ID: {ad.user_id} | Создано: {created_at_str}</small></p>
-                    <a href="/advertisements/{ad.id}?format=html">Подробнее</a>
-                </div>
-                """
+            total = await conn.scalar(
+                select(func.count()).select_from(AD_TABLE).where(fts_match)
+            )
+        
+        if not ads and offset == 0:
+            # FTS ничего не нашел: нечеткий поиск по заголовку (pg_trgm)
+            # на случай опечаток, на том же соединении. Только для первой
+            # страницы: пустая страница дальше по FTS — это конец выдачи,
+            # а не повод смешивать ее с другим набором результатов
+            fuzzy_query = select(*ad_columns(request['user_id'])).where(
+                AD_TABLE.c.title.op('%')(query_text)
+            ).order_by(
+                func.similarity(AD_TABLE.c.title, query_text).desc()
+            ).limit(limit)
+            result = await conn.execute(fuzzy_query)
+            ads = result.all()
+            # Нечеткие совпадения отдаются одной страницей
+            total = len(ads)
+    
+    if wants_html(request):
+        # Страница отдается по частям: заголовок уходит клиенту сразу,
+        # карточки — пачками, без сборки всей страницы в одну строку
+        response = web.StreamResponse(headers={'Content-Type': 'text/html; charset=utf-8'})
+        await response.prepare(request)
+        await response.write(templates.SEARCH_PAGE_HEAD.format(
+            query=escape(query_text), count=total,
+            first=offset + 1 if ads else 0, last=offset + len(ads),
+        ).encode('utf-8'))
+        if not ads:
+            await response.write(SEARCH_NO_RESULTS_BODY)
+        for start in range(0, len(ads), SEARCH_STREAM_BATCH):
+            await response.write("".join(
+                templates.SEARCH_AD_CARD.format(
+                    id=ad.id,
+                    title=escape(ad.title),
+                    description=escape(ad.description),
+                    created_at=format_created_at(ad.created_at),
+                    user_id=ad.user_id,
+                )
+                for ad in ads[start:start + SEARCH_STREAM_BATCH]
+            ).encode('utf-8'))
         
-        html += """
-            </div>
-            <a href="/advertisements?format=html">← Назад к списку</a>
-        </body>
-        </html>
-        """
-        return web.Response(text=html, content_type='text/html')
+        # Ссылки на соседние страницы выдачи
+        has_prev = offset > 0
+        has_next = offset + len(ads) < total
+        if has_prev or has_next:
+            link_query = escape(quote(query_text))
+            nav = [templates.PAGINATION_HEAD]
+            if has_prev:
+                nav.append(templates.SEARCH_PREV_LINK.format(
+                    query=link_query, limit=limit, offset=max(0, offset - limit)
+                ))
+            if has_next:
+                nav.append(templates.SEARCH_NEXT_LINK.format(
+                    query=link_query, limit=limit, offset=offset + len(ads)
+                ))
+            nav.append(templates.PAGINATION_FOOT)
+            await response.write("".join(nav).encode('utf-8'))
+        await response.write(SEARCH_PAGE_FOOT_BODY)
+        await response.write_eof()
+        return response
     
     # JSON ответ
-    results = []
-    for ad in ads:
-        ad_data = ad.json
-        ad_data['is_owner'] = (current_user_id == ad.user_id) if current_user_id else False
-        results.append(ad_data)
-    
-    return web.json_response({
+    return json_response({
         "query": query_text,
-        "results": results,
-        "count": len(ads)
+        "results": [ad._asdict() for ad in ads],
+        "count": total,
+        "returned": len(ads),
+        "limit": limit,
+        "offset": offset,
     })
 
 
+# Главная страница статична: кодируем ее один раз и отдаем с ETag
+INDEX_BODY = templates.INDEX_PAGE.encode('utf-8')
+INDEX_ETAG = f'"{hashlib.md5(INDEX_BODY).hexdigest()}"'
+INDEX_CACHE_HEADERS = {'ETag': INDEX_ETAG, 'Cache-Control': 'public, max-age=3600'}
+INDEX_HEADERS = {**INDEX_CACHE_HEADERS, 'Content-Type': 'text/html; charset=utf-8'}
+
+
 async def index_page(request: web.Request):
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Advertisement API (aiohttp)</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; }
-            h1 { color: #333; }
-            .endpoint { background: #f5f5f5; padding: 15px; margin: 10px 0; border-radius: 5px; }
-            pre { background: #333; color: #fff; padding: 10px; border-radius: 5px; }
-            a { color: #0066cc; text-decoration: none; }
-            a:hover { text-decoration: underline; }
-            .format-links { margin: 20px 0; }
-            .format-links a { 
-                display: inline-block;
-                padding: 10px 20px;
-                margin-right: 10px;
-                background: #667eea;
-                color: white;
-                border-radius: 5px;
-                text-decoration: none;
-            }
-        </style>
-    </head>
-    <body>
-        <h1>📢 REST API для объявлений (aiohttp)</h1>
-        
-        <div class="format-links">
-            <a href="/advertisements">📋 Просмотреть объявления</a>
-            <a href="/advertisements?format=html">🌐 HTML версия</a>
-        </div>
-        
-        <div class="endpoint">
-            <h2>📝 POST /register</h2>
-            <p>Регистрация пользователя</p>
-            <pre>curl -X POST http://localhost:8080/register \\
-  -H "Content-Type: application/json" \\
-  -d '{"email":"user@example.com","password":"password"}'</pre>
-        </div>
-        
-        <div class="endpoint">
-            <h2>🔑 POST /login</h2>
-            <p>Вход пользователя (получение JWT токена)</p>
-            <pre>curl -X POST http://localhost:8080/login \\
-  -H "Content-Type: application/json" \\
-  -d '{"email":"user@example.com","password":"password"}'</pre>
-        </div>
-        
-        <div class="endpoint">
-            <h2>📋 GET <a href="/advertisements">/advertisements</a></h2>
-            <p>Получить все объявления</p>
-            <p>Поддерживает пагинацию: <code>?page=1&per_page=10</code></p>
-            <p>Фильтрация по пользователю: <code>?user_id=1</code></p>
-        </div>
-        
-        <div class="endpoint">
-            <h2>➕ POST /advertisements</h2>
-            <p>Создать новое объявление (требуется токен)</p>
-            <pre>curl -X POST http://localhost:8080/advertisements \\
-  -H "Content-Type: application/json" \\
-  -H "Authorization: Bearer YOUR_TOKEN" \\
-  -d '{"title":"Продам машину","description":"Хорошая машина"}'</pre>
-        </div>
-        
-        <div class="endpoint">
-            <h2>🔍 GET <a href="/advertisements/search?q=test">/advertisements/search?q=запрос</a></h2>
-            <p>Поиск объявлений</p>
-        </div>
-        
-        <div class="endpoint">
-            <h2>📄 GET <a href="/advertisements/1">/advertisements/{id}</a></h2>
-            <p>Получить объявление по ID</p>
-            <p>Пример: <a href="/advertisements/1">/advertisements/1</a></p>
-        </div>
-        
-        <div class="endpoint">
-            <h2>✏️ PATCH /advertisements/{id}</h2>
-            <p>Обновить объявление (только владелец)</p>
-            <pre>curl -X PATCH http://localhost:8080/advertisements/1 \\
-  -H "Content-Type: application/json" \\
-  -H "Authorization: Bearer YOUR_TOKEN" \\
-  -d '{"description":"Отличное состояние"}'</pre>
-        </div>
-        
-        <div class="endpoint">
-            <h2>🗑️ DELETE /advertisements/{id}</h2>
-            <p>Удалить объявление (только владелец, возвращает 204)</p>
-            <pre>curl -X DELETE http://localhost:8080/advertisements/1 \\
-  -H "Authorization: Bearer YOUR_TOKEN"</pre>
-        </div>
-        
-        <p><strong>Форматы:</strong> По умолчанию API возвращает JSON. Добавьте <code>?format=html</code> для HTML версии.</p>
-        <p><strong>Аутентификация:</strong> Используйте токен из <code>/login</code> в заголовке <code>Authorization: Bearer &lt;token&gt;</code></p>
-        <p><strong>Порт:</strong> 8080</p>
-    </body>
-    </html>
-    """
-    return web.Response(text=html, content_type='text/html')
+    # If-None-Match может содержать список тегов через запятую
+    if INDEX_ETAG in request.headers.get('If-None-Match', ''):
+        return web.Response(status=304, headers=INDEX_CACHE_HEADERS)
+    return web.Response(body=INDEX_BODY, headers=INDEX_HEADERS)
+
+
+# Общая таблица стилей: читается и сжимается один раз при импорте
+STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'app.css')
+with open(STYLESHEET_PATH, 'rb') as f:
+    STYLESHEET_BODY = f.read()
+STYLESHEET_GZIP = gzip.compress(STYLESHEET_BODY, 9)
+
+
+async def stylesheet(request: web.Request):
+    headers = {'Cache-Control': 'public, max-age=86400', 'Vary': 'Accept-Encoding'}
+    body = STYLESHEET_BODY
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        headers['Content-Encoding'] = 'gzip'
+        body = STYLESHEET_GZIP
+    return web.Response(body=body, content_type='text/css', charset='utf-8', headers=headers)
 
 
 async def db_context(app: web.Application):
     """Контекст для работы с БД"""
     print("📦 Starting database...")
-    await init_db()
+    if app['init_db']:
+        await init_db()
+    # Прогреваем пул: первые запросы не ждут установки соединений
+    pool_size = engine.pool.size()
+    connections = await asyncio.gather(*(engine.connect() for _ in range(pool_size)))
+    await asyncio.gather(*(conn.close() for conn in connections))
     print("✅ Database initialized successfully.")
     
     # Важно: yield должен что-то возвращать!
@@ -744,18 +744,28 @@ async def db_context(app: web.Application):
     print("✅ Database closed.")
 
 
-def create_app():
-    app = web.Application(middlewares=[error_middleware, session_middleware])
+async def prepare_db():
+    """Создание схемы до запуска воркеров: один раз, а не в каждом процессе"""
+    await init_db()
+    # Соединения родителя не должны переходить в дочерние процессы
+    await close_db()
+
+
+def create_app(init_schema: bool = True):
+    app = web.Application(middlewares=[error_middleware, auth_middleware, session_middleware])
+    app['init_db'] = init_schema
     
     # Регистрация роутов
     app.router.add_get('/', index_page)
+    app.router.add_get('/static/app.css', stylesheet)
     app.router.add_post('/register', register_user)
     app.router.add_post('/login', login_user)
     app.router.add_get('/advertisements', list_advertisements)
-    app.router.add_get('/advertisements/{ad_id:\d+}', get_advertisement)
+    app.router.add_get(AD_PATH, get_advertisement)
     app.router.add_post('/advertisements', create_advertisement)
-    app.router.add_patch('/advertisements/{ad_id:\d+}', update_advertisement)
-    app.router.add_delete('/advertisements/{ad_id:\d+}', delete_advertisement)
+    app.router.add_post('/advertisements/bulk', create_advertisements_bulk)
+    app.router.add_patch(AD_PATH, update_advertisement)
+    app.router.add_delete(AD_PATH, delete_advertisement)
     app.router.add_get('/advertisements/search', search_advertisements)
     
     # Добавляем контекст базы данных
@@ -764,6 +774,98 @@ def create_app():
     return app
 
 
+def run_server(init_schema: bool = True, reuse_port: bool = False):
+    """Запуск одного процесса сервера"""
+    # uvloop (libuv) вместо стандартного цикла событий, если доступен.
+    # Цикл передается в run_app напрямую: политики циклов в asyncio устарели
+    try:
+        import uvloop
+    except ImportError:
+        loop = None
+    else:
+        loop = uvloop.new_event_loop()
+    
+    app = create_app(init_schema=init_schema)
+    # Большой backlog для всплесков подключений, keep-alive 75 с;
+    # access log отключен: его форматирование дорого для мелких ответов
+    web.run_app(
+        app,
+        host='0.0.0.0',
+        port=8080,
+        backlog=2048,
+        keepalive_timeout=75,
+        access_log=None,
+        reuse_port=reuse_port,
+        loop=loop,
+    )
+
+
+STOP_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+
+
+def run_workers(workers: int):
+    """Несколько процессов на одном порту (SO_REUSEPORT): ядро распределяет
+    подключения между ними. Родитель только следит за воркерами: пересылает
+    им SIGTERM/SIGINT, собирает завершившиеся и перезапускает упавшие"""
+    asyncio.run(prepare_db())
+    children = set()
+    stopping = False
+    
+    def spawn():
+        # Сигналы блокируются на время fork: иначе stop() может сработать
+        # между fork и children.add и не узнать о новом воркере
+        signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        try:
+            if stopping:
+                return
+            pid = os.fork()
+            if pid == 0:
+                # Воркер: обработчики сигналов родителя ему не нужны
+                for signum in STOP_SIGNALS:
+                    signal.signal(signum, signal.SIG_DFL)
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+                code = 0
+                try:
+                    run_server(init_schema=False, reuse_port=True)
+                except BaseException:
+                    traceback.print_exc()
+                    code = 1
+                # os._exit не сбрасывает буферы stdio
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+            children.add(pid)
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    for signum in STOP_SIGNALS:
+        signal.signal(signum, stop)
+    for _ in range(workers):
+        spawn()
+    
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            print(f"⚠️ Воркер {pid} завершился, перезапускаем")
+            time.sleep(1)  # не уходим в цикл быстрых перезапусков
+            # Сигнал остановки мог прийти во время паузы
+            if not stopping:
+                spawn()
+
+
 if __name__ == '__main__':
     print("\n" + "="*50)
     print("📢 Advertisement API (aiohttp) запущен!")
@@ -772,6 +874,11 @@ if __name__ == '__main__':
     print("📊 JSON по умолчанию, ?format=html для HTML версии")
     print("="*50 + "\n")
     
-    app = create_app()
-    web.run_app(app, host='0.0.0.0', port=8080)
+    # Пул БД (DB_POOL_SIZE, DB_MAX_OVERFLOW) — на каждый процесс,
+    # поэтому при N воркерах его стоит уменьшать в N раз
+    workers = int(os.getenv("WEB_WORKERS", "1"))
+    if workers > 1:
+        run_workers(workers)
+    else:
+        run_server()
 # [file content end]
\ No newline at end of file
@@ -0,0 +1,235 @@
+# HTML-шаблоны страниц. Статическая часть собирается один раз при импорте,
+# на запрос подставляются только значения (str.format).
+# Стили вынесены в static/app.css
+
+PAGE_FOOT = """
+</body>
+</html>
+"""
+
+# Список объявлений
+LIST_PAGE_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Список объявлений</title>
+    <link rel="stylesheet" href="/static/app.css">
+</head>
+<body class="page-list">
+    <h1>📢 Все объявления</h1>
+
+    <div class="format-links">
+        <a href="/">🏠 На главную</a>
+        <a href="/advertisements">📊 JSON версия</a>
+    </div>
+
+    <div class="stats">
+        <strong>Статистика:</strong>
+        Всего объявлений: {total}<br>
+        Страница {page} из {pages}<br>
+        Показано: {shown} объявлений
+    </div>
+"""
+
+LIST_AD_CARD = """
+    <div class="ad">
+        <h3>
+            {title}
+            {badge}
+        </h3>
+        <p>{description}</p>
+        <div class="ad-meta">
+            📅 Создано: {created_at}<br>
+            👤 ID пользователя: {user_id}
+        </div>
+        <div class="actions">
+            <a href="/advertisements/{id}?format=html">Подробнее</a>
+        </div>
+    </div>
+"""
+
+LIST_OWN_BADGE = '<span class="own-badge">Ваше</span>'
+
+PAGINATION_HEAD = '<div class="pagination" style="margin-top: 20px;">'
+PAGINATION_CURRENT = '<span style="margin: 0 5px; font-weight: bold;">{page}</span>'
+PAGINATION_LINK = (
+    '<a href="/advertisements?format=html&page={page}&per_page={per_page}" '
+    'style="margin: 0 5px;">{page}</a>'
+)
+PAGINATION_GAP = '<span style="margin: 0 5px;">…</span>'
+PAGINATION_FOOT = '</div>'
+
+# Одно объявление
+AD_PAGE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{title}</title>
+    <link rel="stylesheet" href="/static/app.css">
+</head>
+<body class="page-ad">
+    <h1>
+        {title}
+        {badge}
+    </h1>
+
+    <div class="format-links">
+        <a href="/advertisements/{id}">📊 JSON версия</a>
+        <a href="/advertisements">← Назад к списку</a>
+    </div>
+
+    <div class="ad-details">
+        <p><strong>Описание:</strong></p>
+        <p>{description}</p>
+
+        <p><strong>Детали:</strong></p>
+        <ul>
+            <li><strong>ID объявления:</strong> {id}</li>
+            <li><strong>ID пользователя:</strong> {user_id}</li>
+            <li><strong>Дата создания:</strong> {created_at}</li>
+            <li><strong>Принадлежит вам:</strong> {owned}</li>
+        </ul>
+    </div>
+
+    <div style="margin-top: 30px;">
+        <a href="/">🏠 На главную</a>
+    </div>
+</body>
+</html>
+"""
+
+AD_OWN_BADGE = '<span class="own-badge">Ваше объявление</span>'
+
+# Результаты поиска
+SEARCH_PAGE_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Поиск: {query}</title>
+    <link rel="stylesheet" href="/static/app.css">
+</head>
+<body class="page-search">
+    <h1>🔍 Результаты поиска: "{query}"</h1>
+    <p>Найдено: {count} объявлений, показаны {first}–{last}</p>
+
+    <div class="search-results">
+"""
+
+SEARCH_AD_CARD = """
+        <div class="ad">
+            <h3>{title}</h3>
+            <p>{description}</p>
+            <p><small>User ID: {user_id} | Создано: {created_at}</small></p>
+            <a href="/advertisements/{id}?format=html">Подробнее</a>
+        </div>
+"""
+
+SEARCH_PREV_LINK = (
+    '<a href="/advertisements/search?format=html&q={query}&limit={limit}&offset={offset}" '
+    'style="margin: 0 5px;">← Назад</a>'
+)
+SEARCH_NEXT_LINK = (
+    '<a href="/advertisements/search?format=html&q={query}&limit={limit}&offset={offset}" '
+    'style="margin: 0 5px;">Дальше →</a>'
+)
+
+SEARCH_NO_RESULTS = '<p class="no-results">Ничего не найдено</p>'
+
+SEARCH_PAGE_FOOT = """
+    </div>
+    <a href="/advertisements?format=html">← Назад к списку</a>
+</body>
+</html>
+"""
+
+# Главная страница целиком статична
+INDEX_PAGE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Advertisement API (aiohttp)</title>
+    <link rel="stylesheet" href="/static/app.css">
+</head>
+<body class="page-index">
+    <h1>📢 REST API для объявлений (aiohttp)</h1>
+
+    <div class="format-links">
+        <a href="/advertisements">📋 Просмотреть объявления</a>
+        <a href="/advertisements?format=html">🌐 HTML версия</a>
+    </div>
+
+    <div class="endpoint">
+        <h2>📝 POST /register</h2>
+        <p>Регистрация пользователя</p>
+        <pre>curl -X POST http://localhost:8080/register \\
+  -H "Content-Type: application/json" \\
+  -d '{"email":"user@example.com","password":"password"}'</pre>
+    </div>
+
+    <div class="endpoint">
+        <h2>🔑 POST /login</h2>
+        <p>Вход пользователя (получение JWT токена)</p>
+        <pre>curl -X POST http://localhost:8080/login \\
+  -H "Content-Type: application/json" \\
+  -d '{"email":"user@example.com","password":"password"}'</pre>
+    </div>
+
+    <div class="endpoint">
+        <h2>📋 GET <a href="/advertisements">/advertisements</a></h2>
+        <p>Получить все объявления</p>
+        <p>Поддерживает пагинацию: <code>?page=1&per_page=10</code> (per_page не больше 100)</p>
+        <p>Фильтрация по пользователю: <code>?user_id=1</code></p>
+    </div>
+
+    <div class="endpoint">
+        <h2>➕ POST /advertisements</h2>
+        <p>Создать новое объявление (требуется токен)</p>
+        <pre>curl -X POST http://localhost:8080/advertisements \\
+  -H "Content-Type: application/json" \\
+  -H "Authorization: Bearer YOUR_TOKEN" \\
+  -d '{"title":"Продам машину","description":"Хорошая машина"}'</pre>
+    </div>
+
+    <div class="endpoint">
+        <h2>📦 POST /advertisements/bulk</h2>
+        <p>Создать до 100 объявлений одним запросом (требуется токен)</p>
+        <pre>curl -X POST http://localhost:8080/advertisements/bulk \\
+  -H "Content-Type: application/json" \\
+  -H "Authorization: Bearer YOUR_TOKEN" \\
+  -d '[{"title":"Продам стол","description":"Почти новый стол"},{"title":"Продам стул","description":"Удобный мягкий стул"}]'</pre>
+    </div>
+
+    <div class="endpoint">
+        <h2>🔍 GET <a href="/advertisements/search?q=test">/advertisements/search?q=запрос</a></h2>
+        <p>Поиск объявлений</p>
+        <p>Ограничение выдачи: <code>?limit=20&offset=0</code> (limit не больше 100)</p>
+    </div>
+
+    <div class="endpoint">
+        <h2>📄 GET <a href="/advertisements/1">/advertisements/{id}</a></h2>
+        <p>Получить объявление по ID</p>
+        <p>Пример: <a href="/advertisements/1">/advertisements/1</a></p>
+    </div>
+
+    <div class="endpoint">
+        <h2>✏️ PATCH /advertisements/{id}</h2>
+        <p>Обновить объявление (только владелец)</p>
+        <pre>curl -X PATCH http://localhost:8080/advertisements/1 \\
+  -H "Content-Type: application/json" \\
+  -H "Authorization: Bearer YOUR_TOKEN" \\
+  -d '{"description":"Отличное состояние"}'</pre>
+    </div>
+
+    <div class="endpoint">
+        <h2>🗑️ DELETE /advertisements/{id}</h2>
+        <p>Удалить объявление (только владелец, возвращает 204)</p>
+        <pre>curl -X DELETE http://localhost:8080/advertisements/1 \\
+  -H "Authorization: Bearer YOUR_TOKEN"</pre>
+    </div>
+
+    <p><strong>Форматы:</strong> По умолчанию API возвращает JSON. Добавьте <code>?format=html</code> для HTML версии.</p>
+    <p><strong>Аутентификация:</strong> Используйте токен из <code>/login</code> в заголовке <code>Authorization: Bearer &lt;token&gt;</code></p>
+    <p><strong>Порт:</strong> 8080</p>
+</body>
+</html>
+"""